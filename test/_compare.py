@@ -0,0 +1,637 @@
+""" Utilities for comparing the state of a Tkinter canvas against expected 
+    images, for testing the `tkinter_spheres_environment_gui` package.
+
+Canvas states are captured as postscript data, rendered with [Ghostscript], 
+and compared via digests of the rendered pixel data. This module is shared by 
+all test modules, via the fixtures in `fixtures.py`.
+
+[Ghostscript]: https://www.ghostscript.com
+
+"""
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import os, subprocess, and tempfile.
+import os
+import os.path
+import subprocess
+import tempfile
+
+# Import atexit, collections, concurrent.futures, functools, hashlib, 
+# multiprocessing, and re.
+import atexit
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import multiprocessing
+import re
+
+# Import the optional xxhash package.
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# Load the Python Imaging Library.
+@functools.lru_cache(maxsize=None)
+def _pil():
+    """ Import the [Python Imaging Library] on first use, rather than at 
+        module load, so that test collection -- and runs that never compare 
+        images -- do not pay for initializing it.
+    
+    [Python Imaging Library]: https://pillow.readthedocs.io/en/stable/
+    """
+    import PIL.Image
+    import PIL.EpsImagePlugin
+    return PIL
+    
+  
+
+# Load the optional Ghostscript API bindings.
+@functools.lru_cache(maxsize=None)
+def _ghostscript_module():
+    """ Import the optional [ghostscript] package, which exposes the 
+        Ghostscript API in-process. Returns None if the package -- or the 
+        Ghostscript shared library that it wraps -- is unavailable.
+    
+    [ghostscript]: https://pypi.org/project/ghostscript/
+    """
+    try:
+        import ghostscript
+    except (ImportError, RuntimeError):
+        return None
+    return ghostscript
+    
+  
+
+# Run Ghostscript.
+def _run_ghostscript(arguments):
+    """ Run Ghostscript with the specified command-line arguments.
+    
+    If the optional `ghostscript` package is available, then Ghostscript runs 
+    in the current process, avoiding the cost of creating a process. 
+    Otherwise, the Ghostscript executable is invoked as a subprocess.
+    """
+    
+    # Run Ghostscript in-process, if possible.
+    # The first argument is a program name, as for the executable.
+    ghostscript = _ghostscript_module()
+    if ghostscript:
+        with ghostscript.Ghostscript('gs', *arguments): pass
+        return
+    
+    # Locate the Ghostscript executable in the same manner as PIL.
+    if not _pil().EpsImagePlugin.has_ghostscript():
+        raise OSError('Unable to locate Ghostscript on paths')
+    
+    # Run Ghostscript in a subprocess.
+    command = [_pil().EpsImagePlugin.gs_binary, *arguments]
+    subprocess.run(command, check=True)
+    
+  
+
+# Test for the availability of Ghostscript.
+def has_ghostscript():
+    """ Return True if Ghostscript is available for rendering postscript 
+        data, either in-process or as an executable. """
+    if _ghostscript_module(): return True
+    return bool(_pil().EpsImagePlugin.has_ghostscript())
+    
+  
+
+# Render a batch of postscript documents with a single Ghostscript process.
+class RasterBatch:
+    """ Renders a batch of postscript documents with a single Ghostscript 
+        invocation.
+    
+    PIL renders postscript by launching a Ghostscript process for each image. 
+    Instead, every document in the batch is rendered to a separate raw PPM 
+    page by one Ghostscript run (see `_run_ghostscript`), and the pages are 
+    then decoded in-process by PIL. 
+    Each page is sized and offset according to the document bounding box, as 
+    PIL does for a single document.
+    
+    Attributes
+    ----------
+    postscripts : list of str
+        Postscript image data for each document in the batch.
+    resolution : int
+        Rendering resolution, in dots per inch.
+    """
+    
+    # Pattern for parsing the document bounding box.
+    _BOUNDING_BOX = re.compile(r'^%%BoundingBox:\s*(-?\d+)\s+(-?\d+)'
+                               r'\s+(-?\d+)\s+(-?\d+)\s*$', flags=re.M)
+    
+    def __init__(self, postscripts=(), resolution=72):
+        self.postscripts = list(postscripts)
+        self.resolution = resolution
+        
+    def bounding_box(self, postscript):
+        """ Parse the bounding box of a postscript document. """
+        match = self._BOUNDING_BOX.search(postscript)
+        if not match:
+            raise ValueError('Postscript data has no bounding box.')
+        return tuple(int(v) for v in match.groups())
+        
+    def arguments(self, input_paths, output_pattern):
+        """ Construct the Ghostscript arguments for rendering the batch. """
+        
+        # Initialize the Ghostscript arguments.
+        arguments = ['-q',
+                     f'-r{self.resolution}',
+                     '-dBATCH',
+                     '-dNOPAUSE',
+                     '-dSAFER',
+                     '-sDEVICE=ppmraw',
+                     f'-sOutputFile={output_pattern}']
+        
+        # Size and offset each page according to the document bounding box.
+        # Each Tk canvas document ends with its own `showpage`.
+        for (postscript, path) in zip(self.postscripts, input_paths):
+            (x0, y0, x1, y1) = self.bounding_box(postscript)
+            (w, h) = (x1 - x0, y1 - y0)
+            setup = (f'<</PageSize [{w} {h}]>> setpagedevice '
+                     f'{-x0} {-y0} translate')
+            arguments += ['-c', setup, '-f', path]
+        
+        # Return the result.
+        return arguments
+        
+    def render(self):
+        """ Render the batch.
+        
+        Each image is yielded while the rendered pages are still on disk, and 
+        is only valid until the generator resumes, so that the batch is never 
+        held in memory at once. Callers that need an image afterwards must 
+        copy it.
+        
+        Yields
+        ------
+        image : PIL.Image
+            A loaded RGB image for each document, in order.
+        
+        Raises
+        ------
+        RuntimeError
+            If the number of rendered pages differs from the number of 
+            documents.
+        """
+        
+        # Nothing to render.
+        if not self.postscripts: return
+        
+        # Render into a temporary directory.
+        with tempfile.TemporaryDirectory() as directory:
+            
+            # Write each document to a file.
+            input_paths = []
+            for (index, postscript) in enumerate(self.postscripts):
+                path = os.path.join(directory, f'input-{index}.ps')
+                with open(path, 'w') as f: f.write(postscript)
+                input_paths.append(path)
+            
+            # Render all documents with one Ghostscript run.
+            output_pattern = os.path.join(directory, 'page-%d.ppm')
+            _run_ghostscript(self.arguments(input_paths, output_pattern))
+            
+            # Verify that exactly one page was rendered per document, so that 
+            # pages cannot be silently matched with the wrong documents (e.g., 
+            # if a document omits `showpage`, or invokes it more than once).
+            num_pages = sum(1 for name in os.listdir(directory) 
+                            if name.startswith('page-'))
+            if num_pages != len(self.postscripts):
+                message = f'Ghostscript rendered {num_pages} pages for ' \
+                          f'{len(self.postscripts)} postscript documents'
+                raise RuntimeError(message)
+            
+            # Decode the rendered pages, one at a time. Pages are numbered 
+            # from one.
+            for index in range(1, len(self.postscripts) + 1):
+                path = output_pattern.replace('%d', str(index))
+                with _pil().Image.open(path) as image:
+                    image.load()
+                    yield image
+    
+  
+
+# Compute a content hash for a postscript string.
+def _psid(postscript):
+    """ Compute a compact content hash for postscript data, for use as a cache
+        key or an identity check.
+    
+    The 128-bit XXH3 hash is used if the optional [xxhash] package is 
+    installed, since it is considerably faster than cryptographic hashes for 
+    inputs of this size. Otherwise, a 128-bit BLAKE2b hash is used.
+    
+    [xxhash]: https://pypi.org/project/xxhash/
+    """
+    is_str = isinstance(postscript, str)
+    data = postscript.encode('utf-8') if is_str else postscript
+    if xxhash: return xxhash.xxh3_128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+    
+  
+
+# Postscript header comments that vary between otherwise identical canvases.
+_VOLATILE_PS_COMMENTS \
+  = re.compile(rb'^%%(CreationDate|Title|For|CreationClass).*$', flags=re.M)
+
+# Strip volatile metadata from a postscript string.
+def _canonicalize_ps(postscript):
+    """ Remove header comments -- such as the creation date -- that do not 
+        affect the rendered image, and return the result as bytes. """
+    return _VOLATILE_PS_COMMENTS.sub(b'', postscript.encode('utf-8'))
+    
+  
+
+# Compute a content hash for a postscript string, ignoring metadata.
+def _canonical_psid(postscript):
+    """ Compute the content hash of postscript data, excluding volatile 
+        metadata (see `_canonicalize_ps` and `_is_same_ps`). """
+    return _psid(_canonicalize_ps(postscript))
+    
+  
+
+# Compute a digest of the pixel data of a PIL image.
+def _digest_image(image, rows=64):
+    """ Compute a digest of the pixel data of a PIL image.
+    
+    The image is hashed in horizontal bands of `rows` pixels, so that the full 
+    raster is never copied into a single bytes object.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    (width, height) = image.size
+    for top in range(0, height, rows):
+        box = (0, top, width, min(top + rows, height))
+        digest.update(image.crop(box).tobytes())
+    return digest.digest()
+    
+  
+
+# Render a batch of postscript data and compute digests of the images.
+def _render_digests(postscripts):
+    """ Render postscript data as a single `RasterBatch`, and return a digest 
+        of the pixel data of each image.
+    
+    This function is defined at module level so that it can be submitted to a 
+    worker process.
+    """
+    
+    # Hash each page as it is decoded. The batch closes each page before 
+    # decoding the next.
+    images = RasterBatch(postscripts).render()
+    return [_digest_image(image) for image in images]
+    
+  
+
+# Worker processes for rendering postscript data, initialized on first use.
+_POOL = None
+_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# Access the worker process pool.
+def _render_pool():
+    """ Create -- on first use -- and return a pool of worker processes for 
+        rendering postscript data concurrently.
+    
+    Workers are started with the `forkserver` method where available, or 
+    `spawn` otherwise, rather than forked from the test process, which holds 
+    a Tk interpreter. The pool is shut down when the interpreter exits.
+    """
+    global _POOL
+    if _POOL is None:
+        methods = multiprocessing.get_all_start_methods()
+        method = 'forkserver' if ('forkserver' in methods) else 'spawn'
+        context = multiprocessing.get_context(method)
+        _POOL = concurrent.futures.ProcessPoolExecutor(max_workers=_POOL_SIZE,
+                                                       mp_context=context)
+        atexit.register(_POOL.shutdown)
+    return _POOL
+    
+  
+
+# Digests of rendered postscript data, keyed by content hash, in order of 
+# least- to most-recent use.
+_DECODE_CACHE = collections.OrderedDict()
+_DECODE_CACHE_SIZE = 128
+
+# Render a batch of postscript data, caching the results by content hash.
+def decode_ps_batch(postscripts):
+    """ Render postscript data and return digests of the image pixel data.
+    
+    Rendering invokes Ghostscript, so results are cached by content hash. Any 
+    postscript data not found in the cache are rendered in batches -- one 
+    `RasterBatch` per worker process -- that run concurrently.
+    
+    Arguments
+    ---------
+    postscripts : list of str
+        Postscript image data.
+    
+    Returns
+    -------
+    digests : list of bytes
+        A digest of the rendered image pixel data, for each input.
+    """
+    
+    # Look up cached digests.
+    hashes = [_psid(ps) for ps in postscripts]
+    missing = {}
+    for (ps_hash, postscript) in zip(hashes, postscripts):
+        if ps_hash in _DECODE_CACHE: _DECODE_CACHE.move_to_end(ps_hash)
+        else: missing.setdefault(ps_hash, postscript)
+    
+    # Render any missing images. If there is more than one, then split them 
+    # into one batch per worker process, so that Ghostscript invocations 
+    # overlap on multi-core machines.
+    postscripts = list(missing.values())
+    if len(postscripts) > 1 and _POOL_SIZE > 1:
+        num_batches = min(_POOL_SIZE, len(postscripts))
+        batches = [postscripts[n::num_batches] for n in range(num_batches)]
+        futures = [_render_pool().submit(_render_digests, batch) 
+                   for batch in batches]
+        rendered = [None] * len(postscripts)
+        for (n, future) in enumerate(futures):
+            rendered[n::num_batches] = future.result()
+    else:
+        rendered = _render_digests(postscripts)
+    _DECODE_CACHE.update(zip(missing, rendered))
+    
+    # Collect the results, and then evict the least recently used digests.
+    digests = [_DECODE_CACHE[ps_hash] for ps_hash in hashes]
+    while len(_DECODE_CACHE) > _DECODE_CACHE_SIZE:
+        _DECODE_CACHE.popitem(last=False)
+    
+    # Return the result.
+    return digests
+    
+  
+
+# Render postscript data, via the cache.
+def decode_ps(postscript):
+    """ Render postscript data and return a digest of the image pixel data. """
+    (digest,) = decode_ps_batch([postscript])
+    return digest
+    
+  
+
+# Identify the software used to render postscript data.
+@functools.lru_cache(maxsize=None)
+def _renderer_id():
+    """ Identify the software used to render postscript data, so that 
+        rendered digests persisted across test runs are invalidated whenever 
+        the renderer changes. """
+    ghostscript = _ghostscript_module()
+    if ghostscript:
+        return f"ppmraw-libgs-{ghostscript.revision()['revision']}"
+    gs_version = ''
+    if _pil().EpsImagePlugin.has_ghostscript():
+        command = [_pil().EpsImagePlugin.gs_binary, '--version']
+        result = subprocess.run(command, capture_output=True, text=True)
+        gs_version = result.stdout.strip()
+    return f'ppmraw-gs-{gs_version}'
+    
+  
+
+# Construct a key for persisting the rendered digest of postscript data.
+def _persistent_key(postscript):
+    """ Construct a content-addressed pytest cache key for the rendered digest 
+        of postscript data. """
+    return f'ps_decode/{_renderer_id()}/{_psid(postscript).hex()}'
+    
+  
+
+# Load postscript data from file, caching the result.
+@functools.lru_cache(maxsize=64)
+def _load_ps(filepath, mtime):
+    """ Load postscript data from a file.
+    
+    The `mtime` argument should be the modification time of the file, so that 
+    the cached copy is refreshed whenever the file is re-written.
+    """
+    with open(filepath, 'r') as f: return f.read()
+    
+  
+
+# Compute a digest of a rasterized image file, caching the result.
+@functools.lru_cache(maxsize=64)
+def _load_image_digest(filepath, mtime):
+    """ Load a rasterized image (e.g., a PNG file) and compute a digest of the 
+        RGB pixel data, comparable with the output of `decode_ps`.
+    
+    The `mtime` argument should be the modification time of the file, so that 
+    the cached digest is refreshed whenever the file is re-written.
+    """
+    with _pil().Image.open(filepath) as image:
+        with image.convert('RGB') as rgb_image:
+            return _digest_image(rgb_image)
+    
+  
+
+# Construct the path of a rasterized snapshot of a postscript file.
+def _snapshot_name(filepath):
+    """ Return the path of the PNG snapshot of a postscript file, as rendered 
+        by the current renderer.
+    
+    The renderer (see `_renderer_id`) is recorded in the file name, so that a 
+    snapshot is never compared against images rendered by other software, 
+    which might differ in anti-aliasing or color conversion.
+    """
+    return f'{os.path.splitext(filepath)[0]}.{_renderer_id()}.png'
+    
+  
+
+# Locate an up-to-date rasterized snapshot of a postscript file.
+def _snapshot_path(filepath):
+    """ Return the path of the PNG snapshot of a postscript file, or None if 
+        there is no snapshot from the current renderer, or if it is older than 
+        the postscript file.
+    
+    Snapshots are generated by the `convert_fixtures` module.
+    """
+    snapshot_filepath = _snapshot_name(filepath)
+    if not os.path.exists(snapshot_filepath): return None
+    if os.path.getmtime(snapshot_filepath) < os.path.getmtime(filepath):
+        return None
+    return snapshot_filepath
+    
+  
+
+# Compare two postscript strings, ignoring metadata.
+def _is_same_ps(expected_ps, observed_ps):
+    """ Return True if two postscript strings are identical, apart from 
+        metadata.
+    
+    Postscript data that are identical apart from metadata must render 
+    identical images, so comparisons use this check to skip rendering. The 
+    converse does not hold: different drawing commands can produce the same 
+    image, so a False result must be resolved by rendering both images (see 
+    `_is_same_rendering`).
+    """
+    return _canonical_psid(expected_ps) == _canonical_psid(observed_ps)
+    
+  
+
+# Compare two images specified as postscript strings, by rendering them.
+def _is_same_rendering(expected_ps, observed_ps, cache=None):
+    """ Render two postscript images and compare digests of the pixel data.
+    
+    The postscript data cannot be compared directly, because the metadata and 
+    comments might differ, and because different drawing commands can produce 
+    the same image.
+    
+    Arguments
+    ---------
+    expected_ps : str
+        Postscript image data for the expected image.
+    observed_ps : str
+        Postscript image data for the observed image.
+    cache : _pytest.cacheprovider.Cache
+        The pytest cache (i.e., `request.config.cache`). If provided, then the 
+        digest of the rendered expected image is persisted across test runs, 
+        using a key derived from its content and the renderer. The observed 
+        image -- which is the subject of the test -- is always rendered.
+    
+    Returns
+    -------
+    is_same_image : bool
+        True if the two images are visually-equivalent.
+    """
+    
+    # Look up the expected image digest in the persistent cache.
+    # The cache stores JSON values, so the digest is stored as a hex string.
+    key = _persistent_key(expected_ps) if cache is not None else None
+    expected_digest = cache.get(key, None) if cache is not None else None
+    
+    # Render the observed image and, if necessary, the expected image.
+    if expected_digest is None:
+        postscripts = [expected_ps, observed_ps]
+        (expected_digest, observed_digest) = decode_ps_batch(postscripts)
+        if cache is not None: cache.set(key, expected_digest.hex())
+    else:
+        expected_digest = bytes.fromhex(expected_digest)
+        observed_digest = decode_ps(observed_ps)
+    
+    # Compare the pixel data.
+    is_same_image = (expected_digest == observed_digest)
+    
+    # Return the result.
+    return is_same_image
+    
+  
+
+# Write the observed canvas to file as the expected state, instead of only 
+# comparing against it. Set to True in order to (re-)generate expected data.
+WRITE_EXPECTED_DATA = False
+
+# Construct a comparison function specialized for an expected state.
+def make_expected_matcher(filepath, cache=None):
+    """ Construct a function that tests whether or not postscript data match 
+        the expected state stored in a postscript file.
+    
+    The expected postscript data are loaded, canonicalized, and hashed once, 
+    when the matcher is constructed, so that each comparison against a 
+    matching canvas costs a single hash of the observed data. Otherwise, the 
+    observed image is rendered and compared against the PNG snapshot of the 
+    expected state -- if an up-to-date snapshot exists -- or against the 
+    rendered expected postscript data.
+    
+    Arguments
+    ---------
+    filepath : str
+        File path to a postscript file containing the expected state.
+    cache : _pytest.cacheprovider.Cache
+        Optional pytest cache, used to persist the rendered expected image 
+        across test runs (see `_is_same_rendering`).
+    
+    Returns
+    -------
+    matcher : callable
+        A function that accepts observed postscript data and returns True if 
+        the rendered image matches the expected state. The matcher does not 
+        detect subsequent changes to `filepath`.
+    """
+    
+    # Load and hash the expected postscript data.
+    expected_ps = _load_ps(filepath, os.path.getmtime(filepath))
+    expected_psid = _canonical_psid(expected_ps)
+    snapshot_filepath = _snapshot_path(filepath)
+    
+    # Define the matcher.
+    def matcher(observed_ps):
+        
+        # Skip rendering if the data match apart from metadata (see 
+        # `_is_same_ps`).
+        if _canonical_psid(observed_ps) == expected_psid: return True
+        
+        # If an up-to-date PNG snapshot of the expected state exists, then 
+        # compare against the snapshot, so that only the observed image is 
+        # rendered.
+        if snapshot_filepath:
+            mtime = os.path.getmtime(snapshot_filepath)
+            expected_digest = _load_image_digest(snapshot_filepath, mtime)
+            return (expected_digest == decode_ps(observed_ps))
+        
+        # Otherwise, render and compare the postscript data.
+        return _is_same_rendering(expected_ps, observed_ps, cache=cache)
+        
+    # Return the result.
+    return matcher
+    
+  
+
+# Test whether or not a canvas matches some expected state.
+def is_expected_state(canvas, filepath, write_expected_data=None, cache=None):
+    """ Tests whether or not the current canvas matches some expected state.
+    
+    Arguments
+    ---------
+    canvas : tkinter.Canvas
+        The canvas to test.
+    filepath : str
+        File path to a postscript file containing the expected state of the 
+        canvas. If a PNG snapshot rendered by the current renderer exists 
+        (see `_snapshot_name`), and is newer than the postscript file, 
+        then the observed canvas is compared against it instead (see 
+        `convert_fixtures`).
+    write_expected_data : bool
+        If True, then the current canvas is first saved to `filepath`. 
+        Defaults to `WRITE_EXPECTED_DATA`.
+    cache : _pytest.cacheprovider.Cache
+        Optional pytest cache, used to persist the rendered expected image 
+        across test runs (see `_is_same_rendering`).
+        
+    Returns
+    -------
+    is_expected_state : bool
+        A boolean value indicating whether or not the observed canvas state 
+        matches the expected canvas state.
+    """
+    
+    # Initialize default arguments.
+    if write_expected_data is None: write_expected_data = WRITE_EXPECTED_DATA
+    
+    # Generate postscript data for the current canvas.
+    observed_ps = canvas.postscript(colormode='color')
+    
+    # To generate the image.
+    if write_expected_data:
+      with open(filepath, 'w') as f: f.write(observed_ps)
+      
+    # Verify that the observed canvas postscript matches expectations.
+    matcher = make_expected_matcher(filepath, cache=cache)
+    is_expected_state = matcher(observed_ps)
+    
+    # Return the result.
+    return is_expected_state
+    
+  
@@ -0,0 +1,23 @@
+""" Local [pytest] plugin for the `tkinter_spheres_environment_gui` tests.
+
+[pytest]: https://docs.pytest.org
+
+Fixtures are generally imported explicitly by each test module (see 
+`fixtures.py`). Session-scoped fixtures are registered here instead, because 
+pytest would otherwise create a separate instance for each importing module.
+"""
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import session fixtures.
+from .fixtures import session_environment_gui
+from .fixtures import expected_matchers
+from .fixtures import reference_ps_pool
+
@@ -0,0 +1,79 @@
+""" Rasterize expected canvas states stored as postscript files, for testing
+    the `tkinter_spheres_environment_gui` package.
+
+Each postscript file in the data directory is rendered with [Ghostscript] and
+saved alongside the original, as a PNG file with the same base name and the 
+name of the renderer (e.g., `reference_image_0.ppmraw-gs-10.02.1.png`). Tests 
+that find an up-to-date PNG snapshot from the same renderer compare the 
+observed canvas against it, so that Ghostscript is only invoked for the 
+observed image.
+
+Usage examples:
+
+`python -m test.convert_fixtures`
+
+`python -m test.convert_fixtures data`
+
+[Ghostscript]: https://www.ghostscript.com
+
+"""
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import glob, os.path, and sys.
+import glob
+import os.path
+import sys
+
+# Import canvas comparison utilities.
+from ._compare import RasterBatch
+from ._compare import _snapshot_name
+
+
+# Rasterize all postscript files in a directory.
+def convert_fixtures(directory='data'):
+    """ Render every postscript file in a directory -- in a single batch --
+        and save each image as a PNG snapshot (see `_compare._snapshot_name`).
+    
+    Arguments
+    ---------
+    directory : str
+        Path to the directory containing the postscript files.
+    
+    Returns
+    -------
+    filepaths : list of str
+        Paths of the PNG files written.
+    """
+    
+    # Load the postscript data.
+    ps_filepaths = sorted(glob.glob(os.path.join(directory, '*.ps')))
+    postscripts = []
+    for filepath in ps_filepaths:
+        with open(filepath, 'r') as f: postscripts.append(f.read())
+        
+    # Render the images and save them to disk.
+    filepaths = []
+    images = RasterBatch(postscripts).render()
+    for (ps_filepath, image) in zip(ps_filepaths, images):
+        filepath = _snapshot_name(ps_filepath)
+        image.save(filepath, format='PNG')
+        filepaths.append(filepath)
+        
+    # Return the result.
+    return filepaths
+    
+  
+
+# __main__
+if __name__ == '__main__':
+    for filepath in convert_fixtures(*sys.argv[1:2]): print(filepath)
+    
+  
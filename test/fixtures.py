@@ -29,6 +29,12 @@ import pytest
 # Import Tkinter canvas postscript utilities.
 from . import tkinter_canvas_postscript
 
+# Import canvas comparison utilities.
+from . import _compare
+from ._compare import is_expected_state as is_expected_state_function
+from ._compare import make_expected_matcher
+from ._compare import _canonical_psid
+
 # Import tkinter_shapes.
 import tkinter_shapes
 
@@ -36,13 +42,64 @@ import tkinter_shapes
 import tkinter_spheres_environment_gui
 
 
-# Initialize a reference GUI
-@pytest.fixture
-def reference_environment_gui():
+# Remove all objects and canvas items from an environment GUI.
+# This is NOT A PYTEST FIXTURE.
+def clear_environment_gui(environment_gui):
+    """ Destroy all objects in a `spheres_environment` GUI, and delete all 
+        remaining items from the canvas. """
+    
+    # Destroy environment objects.
+    for key in list(environment_gui): environment_gui.destroy_object(key)
+    
+    # Delete any other canvas items (e.g., shapes drawn directly on the canvas).
+    canvas = environment_gui.gui.canvas
+    canvas.delete('all')
+    canvas.update()
+    
+  
+
+# Initialize a GUI that is shared by all tests in a session.
+# Initializing a Tk interpreter is comparatively slow, so tests should reset 
+# the shared canvas -- via the `blank_environment_gui` fixture -- rather than 
+# create new GUIs.
+@pytest.fixture(scope='session')
+def session_environment_gui():
     
     # Initialize a GUI with a spheres_environment interface.
     environment_gui = tkinter_spheres_environment_gui.Environment()
     
+    # Yield the fixture product.
+    yield environment_gui
+    
+    # Cleanup the fixture product. Destroy the GUI explicitly, rather than 
+    # leaving the Tk interpreter to be finalized during garbage collection.
+    clear_environment_gui(environment_gui)
+    environment_gui.gui.destroy()
+    
+  
+
+# Reset the shared GUI to an empty canvas.
+@pytest.fixture
+def blank_environment_gui(session_environment_gui):
+    
+    # Clear the shared GUI.
+    clear_environment_gui(session_environment_gui)
+    
+    # Yield the fixture product.
+    yield session_environment_gui
+    
+    # Cleanup the fixture product.
+    clear_environment_gui(session_environment_gui)
+    
+  
+
+# Initialize a reference GUI
+@pytest.fixture
+def reference_environment_gui(blank_environment_gui):
+    
+    # Initialize shorthand.
+    environment_gui = blank_environment_gui
+    
     # Initialize a rectangular, black polygon, with the same size as the 
     # canvas. This can be necessary to capture the black background, which is 
     # important when the saved test images are used for other purposes (e.g., 
@@ -62,7 +119,57 @@ def reference_environment_gui():
     
     # Cleanup the fixture product.
     del rectangle
-    del environment_gui
+    
+  
+
+# Initialize a session-wide store of comparison functions for expected states.
+@pytest.fixture(scope='session')
+def expected_matchers():
+    """ Comparison functions specialized for expected canvas states, keyed by 
+        the path of the file containing each expected state (see 
+        `make_expected_matcher`). """
+    yield {}
+    
+  
+
+# Initialize a function for comparing a canvas against an expected state.
+@pytest.fixture
+def is_expected_state(request, expected_matchers):
+    """ Test whether or not a canvas matches the expected state stored in a 
+        postscript file. Rendered expected images are persisted in the pytest 
+        cache, so that unchanged files are not re-rendered on subsequent runs.
+    
+    Each expected state file is loaded and hashed once per session. Writing 
+    expected data replaces the stored comparison function for that file.
+    """
+    
+    # Bind the pytest cache, if the cache plugin is enabled.
+    cache = getattr(request.config, 'cache', None)
+    
+    # Define the comparison function.
+    def is_expected_state(canvas, filepath, write_expected_data=None):
+        
+        # Write the expected state, if requested, and invalidate any 
+        # comparison function built from a previous version of the file.
+        if write_expected_data is None:
+            write_expected_data = _compare.WRITE_EXPECTED_DATA
+        if write_expected_data:
+            expected_matchers.pop(filepath, None)
+            return is_expected_state_function(canvas, filepath, 
+                                              write_expected_data=True, 
+                                              cache=cache)
+        
+        # Build the comparison function for this file on first use.
+        if filepath not in expected_matchers:
+            matcher = make_expected_matcher(filepath, cache=cache)
+            expected_matchers[filepath] = matcher
+        
+        # Compare the current canvas against the expected state.
+        observed_ps = canvas.postscript(colormode='color')
+        return expected_matchers[filepath](observed_ps)
+        
+    # Yield the fixture product.
+    yield is_expected_state
     
   
 
@@ -72,12 +179,28 @@ def images_basepath(): return 'data/images'
     
   
 
+# Initialize a session-wide store of postscript data for reference images.
+@pytest.fixture(scope='session')
+def reference_ps_pool():
+    """ Postscript data yielded by the reference image generator, keyed by a 
+        hash of the data excluding metadata. Reference images that differ only 
+        in metadata (e.g., when extracted by different fixture invocations) 
+        share one string. The pool is discarded at the end of the session. """
+    yield {}
+    
+  
+
 # Initialize a generator that yields postscript data for reference images 
 # extracted from the GUI canvas following successive manipulations.
 # This is NOT A PYTEST FIXTURE.
-def reference_image_generator(reference_environment_gui):
+def reference_image_generator(reference_environment_gui, pool=None):
     """ Generator of postscript data for reference images representing a 
-        `spheres_environment` GUI canvas as it is sequentially modified. """
+        `spheres_environment` GUI canvas as it is sequentially modified.
+    
+    If a `pool` dict is provided (see `reference_ps_pool`), then any image 
+    that differs only in metadata from one already in the pool is yielded as 
+    the pooled string instead.
+    """
     
     # Initialize parameters.
     key_a = 'object_a'
@@ -85,7 +208,14 @@ def reference_image_generator(reference_environment_gui):
     
     # Initialize shorthand.
     canvas = reference_environment_gui.gui.canvas
-    extract = tkinter_canvas_postscript.extract
+    
+    # Extract postscript data, re-using any previously-extracted reference 
+    # image that differs only in metadata.
+    def extract(canvas):
+        ps = tkinter_canvas_postscript.extract(canvas)
+        if pool is None: return ps
+        key = _canonical_psid(ps)
+        return pool.setdefault(key, ps)
     
     # Image 0: baseline.
     canvas.update()
@@ -111,10 +241,9 @@ def reference_image_generator(reference_environment_gui):
     # Image 4: Initialize a second object and update the color, position,  
     #          and size properties.
     obj_b = reference_environment_gui.initialize_object(key_b)
-    obj_b.color = (0.0, 1.0, 0.0, 1.0)
-    obj_b.position = (-0.25, 0.25, 0.00)
+    obj_b.update_state(position=(-0.25, 0.25, 0.00), radius=0.10, 
+                       color=(0.0, 1.0, 0.0, 1.0))
     #obj_b.width = 0.10
-    obj_b.radius = 0.10
     canvas.update()
     yield extract(canvas)
     
@@ -128,13 +257,19 @@ def reference_image_generator(reference_environment_gui):
 # Initialize an array of postscript data for reference images extracted from 
 # the GUI canvas.
 @pytest.fixture
-def reference_image_sequence(reference_environment_gui):
+def reference_image_sequence(reference_environment_gui, reference_ps_pool):
     """ Images -- represented as postscript data -- of a spheres_environment 
-        GUI canvas, as it is sequentially modified. """
+        GUI canvas, as it is sequentially modified.
+    
+    Images are not rendered by the fixture, so that consumers can skip 
+    rendering for images that are identical -- apart from metadata -- to 
+    those they are compared against.
+    """
     
     # Initialize parameters.
-    generator = reference_image_generator(reference_environment_gui)
-    yield tuple(ps for ps in generator)
+    generator = reference_image_generator(reference_environment_gui, 
+                                          pool=reference_ps_pool)
+    yield tuple(generator)
     
     # Clean up.
     pass
@@ -0,0 +1,145 @@
+""" Tests conforming with [pytest] framework requirements, for testing the 
+    canvas comparison utilities used by the `tkinter_spheres_environment_gui` 
+    tests.
+
+[pytest]: https://docs.pytest.org
+
+Tests that render postscript data are skipped if [Ghostscript] is not 
+available.
+
+[Ghostscript]: https://www.ghostscript.com
+"""
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import os and pytest.
+import os
+import pytest
+
+# Import canvas comparison utilities.
+from ._compare import RasterBatch
+from ._compare import decode_ps_batch
+from ._compare import has_ghostscript
+from ._compare import _digest_image
+from ._compare import _is_same_rendering
+from ._compare import _load_image_digest
+from ._compare import _pil
+from ._compare import _snapshot_name
+from ._compare import _snapshot_path
+
+
+# Skip tests that render postscript data if Ghostscript is unavailable.
+requires_ghostscript = pytest.mark.skipif(not has_ghostscript(), 
+                                          reason='Ghostscript not found')
+
+# Construct a minimal postscript document containing a filled rectangle.
+def make_postscript(width=40, height=30, color=(1, 0, 0), showpage=True):
+    lines = ['%!PS-Adobe-3.0 EPSF-3.0',
+             f'%%BoundingBox: 0 0 {width} {height}',
+             '{} {} {} setrgbcolor'.format(*color),
+             f'0 0 {width} {height} rectfill']
+    if showpage: lines.append('showpage')
+    return '\n'.join(lines) + '\n'
+    
+  
+
+# Test that each document in a batch is rendered to an image of its own size.
+@requires_ghostscript
+def test_render_batch():
+    sizes = [(40, 30), (20, 10), (40, 30)]
+    postscripts = [make_postscript(w, h) for (w, h) in sizes]
+    observed_sizes = [image.size for image in RasterBatch(postscripts).render()]
+    assert observed_sizes == sizes
+    
+  
+
+# Test that a document without a `showpage` is not silently mis-matched.
+@requires_ghostscript
+def test_render_batch_page_count():
+    postscripts = [make_postscript(), make_postscript(showpage=False)]
+    with pytest.raises(RuntimeError):
+        list(RasterBatch(postscripts).render())
+    
+  
+
+# Test that visually-distinct postscript documents do not match.
+@requires_ghostscript
+def test_is_same_rendering():
+    red_ps = make_postscript(color=(1, 0, 0))
+    blue_ps = make_postscript(color=(0, 0, 1))
+    assert _is_same_rendering(red_ps, red_ps.replace('\n', '\n\n'))
+    assert not _is_same_rendering(red_ps, blue_ps)
+    
+  
+
+# Test that batch digests are returned in input order, including repeats.
+@requires_ghostscript
+def test_decode_ps_batch_order():
+    colors = [(1, 0, 0), (0, 1, 0), (1, 0, 0), (0, 0, 1), (0, 1, 0)]
+    postscripts = [make_postscript(color=c) for c in colors]
+    digests = decode_ps_batch(postscripts)
+    assert len(digests) == len(colors)
+    for (a, digest_a) in zip(colors, digests):
+        for (b, digest_b) in zip(colors, digests):
+            assert (digest_a == digest_b) == (a == b)
+    
+  
+# Initialize a postscript file and a PNG snapshot of it from the current 
+# renderer.
+@pytest.fixture
+def snapshot(tmp_path):
+    
+    # Write the postscript file.
+    ps_filepath = str(tmp_path / 'image.ps')
+    with open(ps_filepath, 'w') as f: f.write(make_postscript())
+    
+    # Write a red snapshot image.
+    filepath = _snapshot_name(ps_filepath)
+    image = _pil().Image.new('RGB', (40, 30), color=(255, 0, 0))
+    image.save(filepath, format='PNG')
+    
+    # Yield the fixture product.
+    yield (ps_filepath, filepath, image)
+    
+  
+
+# Test that an up-to-date snapshot from the current renderer is located.
+def test_snapshot_path(snapshot):
+    (ps_filepath, filepath, image) = snapshot
+    assert _snapshot_path(ps_filepath) == filepath
+    
+  
+
+# Test that a snapshot older than the postscript file is ignored.
+def test_snapshot_path_stale(snapshot):
+    (ps_filepath, filepath, image) = snapshot
+    mtime = os.path.getmtime(ps_filepath)
+    os.utime(filepath, (mtime - 10, mtime - 10))
+    assert _snapshot_path(ps_filepath) is None
+    
+  
+
+# Test that a snapshot from a different renderer is ignored.
+def test_snapshot_path_renderer(snapshot):
+    (ps_filepath, filepath, image) = snapshot
+    os.rename(filepath, os.path.join(os.path.dirname(filepath), 
+                                     'image.ppmraw-other.png'))
+    assert _snapshot_path(ps_filepath) is None
+    
+  
+
+# Test that a snapshot digest matches the digest of the original image.
+def test_load_image_digest(snapshot):
+    (ps_filepath, filepath, image) = snapshot
+    mtime = os.path.getmtime(filepath)
+    assert _load_image_digest(filepath, mtime) == _digest_image(image)
+    
+  
+
@@ -0,0 +1,64 @@
+""" Tests conforming with [pytest] framework requirements, for testing the 
+    postscript utilities used by the `tkinter_spheres_environment_gui` tests.
+
+[pytest]: https://docs.pytest.org
+"""
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import pytest.
+import pytest
+
+# Local imports.
+from . import tkinter_canvas_postscript
+from ._compare import has_ghostscript
+
+# Import fixtures.
+from .fixtures import blank_environment_gui
+
+
+# Initialize an empty canvas with a rectangle drawn on it.
+@pytest.fixture
+def canvas(blank_environment_gui):
+    
+    # Draw a rectangle.
+    canvas = blank_environment_gui.gui.canvas
+    rectangle = canvas.create_rectangle(100, 100, 200, 200, fill='red')
+    canvas.update()
+    
+    # Yield the fixture product.
+    yield canvas
+    
+    # Cleanup the fixture product.
+    canvas.delete(rectangle)
+    canvas.update()
+    
+  
+
+# Test that a canvas matches itself, despite differing metadata.
+def test_equals(canvas):
+    ps_a = tkinter_canvas_postscript.extract(canvas)
+    ps_b = tkinter_canvas_postscript.extract(canvas)
+    assert tkinter_canvas_postscript.equals(ps_a, ps_b)
+    
+  
+
+# Test that a modified canvas does not match the original.
+@pytest.mark.skipif(not has_ghostscript(), reason='Ghostscript not found')
+def test_not_equals(canvas):
+    ps_a = tkinter_canvas_postscript.extract(canvas)
+    canvas.create_oval(300, 300, 400, 400, fill='blue')
+    canvas.update()
+    ps_b = tkinter_canvas_postscript.extract(canvas)
+    assert not tkinter_canvas_postscript.equals(ps_a, ps_b)
+    
+    
+    
+    
\ No newline at end of file
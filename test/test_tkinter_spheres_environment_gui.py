@@ -22,13 +22,21 @@ Usage examples:
 # Contact: a.whit (nml@whit.contact)
 
 
+# Import os, pathlib, and re.
+import os
+import pathlib
+import re
+
 # Import pytest.
 import pytest
 
-# Import Tkinter canvas postscript utilities.
-from . import tkinter_canvas_postscript
+# Import canvas comparison utilities.
+from ._compare import decode_ps_batch
+from ._compare import _is_same_ps
+from ._compare import _load_ps
 
 # Import fixtures.
+from .fixtures import blank_environment_gui
 from .fixtures import reference_environment_gui
 from .fixtures import images_basepath
 from .fixtures import reference_image_sequence
@@ -42,29 +50,40 @@ from .fixtures import reference_image_generator \
 # Save the generated image to disk, if any file does not exist.
 def test_reference_images(reference_image_sequence, images_basepath):
     
+    # Map the index of each reference image stored on disk to its file path, 
+    # in a single pass over the image directory.
+    basepath = pathlib.Path(images_basepath)
+    pattern = re.compile(r'reference_image_(\d+)\.ps')
+    matches = ((pattern.fullmatch(p.name), p) for p in basepath.iterdir())
+    filepaths = {int(m.group(1)): path for (m, path) in matches if m}
+    
     # Iterate through all reference images in the sequence.
+    pairs = {}
     for (index, postscript) in enumerate(reference_image_sequence):
         
-        # Initialize parameters.
-        filename = f'reference_image_{index}.ps'
-        
-        # Initialize the file path.
-        from os import sep
-        filepath = f'{images_basepath}{sep}{filename}'
-        
-        # If a postscript image file does not exist at the specified path, then 
+        # If a postscript image file does not exist for this index, then 
         # generate such a file by saving the reference image postscript data.
-        # Save the generated image to disk, if the file does not exist.
-        import os.path
-        if not os.path.exists(filepath):
-            with open(filepath, 'w') as f: f.write(postscript)
+        if index not in filepaths:
+            filepaths[index] = basepath / f'reference_image_{index}.ps'
+            filepaths[index].write_text(postscript)
         
         # Load a copy of the reference postscript image data from disk.
-        with open(filepath, 'r') as f: postscript_d = f.read()
+        filepath = filepaths[index]
+        stored_postscript = _load_ps(filepath, os.path.getmtime(filepath))
+        
+        # Only render and compare images whose data differ apart from 
+        # metadata (see `_is_same_ps`).
+        if not _is_same_ps(stored_postscript, postscript):
+            pairs[index] = (stored_postscript, postscript)
         
-        # Test the generated image against the image stored on disk.
-        # Verify that the data loaded from disk matches the fixture.
-        assert tkinter_canvas_postscript.equals(postscript_d, postscript)
+    # Test the generated images against the images stored on disk.
+    # Verify that the data loaded from disk matches the fixture, by comparing 
+    # digests of the rendered image pixel data. All images that must be 
+    # rendered are rendered in a single batch.
+    postscripts = [ps for pair in pairs.values() for ps in pair]
+    digests = iter(decode_ps_batch(postscripts))
+    for (index, (stored_digest, digest)) in zip(pairs, zip(digests, digests)):
+        assert stored_digest == digest, f'reference_image_{index}'
     
   
 
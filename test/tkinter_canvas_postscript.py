@@ -64,6 +64,11 @@ Cleanup.
 
 >>> root.destroy()
 
+This module is part of the test package, so the examples must be run as a 
+module of that package:
+
+`python -m test.tkinter_canvas_postscript`
+
 """
 
 # Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
@@ -75,15 +80,13 @@ Cleanup.
 # Contact: a.whit (nml@whit.contact)
 
 
-# Import io and codecs.
+# Import io.
 import io
-import codecs
 
-# Import unittest.
-import unittest
-
-# Import the Python Imaging Library.
-import PIL.Image
+# Import canvas comparison utilities.
+from ._compare import decode_ps_batch
+from ._compare import _pil
+from ._compare import _is_same_ps
 
 
 ## Load postscript image data from file.
@@ -108,7 +111,7 @@ import PIL.Image
 #    return ps
 #    
 #  
-#
+# 
 ## Save postscript image data to file.
 #def save(ps, filepath):
 #    """ Save postscript image data to a file.
@@ -127,7 +130,7 @@ import PIL.Image
 #    with open(filepath, 'w') as f: f.write(ps)
 #    
 #  
-#
+# 
 
 # Extract postscript data from a Tkinter Canvas.
 def extract(canvas):
@@ -154,7 +157,7 @@ def convert_to_image(ps):
     
     Arguments
     ---------
-    ps : str
+    ps : str or bytes
         Postscript image data.
     
     Returns
@@ -167,23 +170,16 @@ def convert_to_image(ps):
     [Python Imaging Library]: https://pillow.readthedocs.io/en/stable/
     """
     
-    # Create a bytes buffer.
-    image_buffer = io.BytesIO()
-    
-    # Create a codec writer to convert the postscript string into bytes.
-    Writer = codecs.getwriter('utf-8')
-    writer = Writer(image_buffer)
-    
-    # Write the postscript data to the buffer and rewind the position.
-    print(ps, file=writer)
-    image_buffer.seek(0)
+    # Encode the postscript data into a bytes buffer.
+    data = ps if isinstance(ps, bytes) else ps.encode('utf-8')
+    image_buffer = io.BytesIO(data)
     
     # Open the buffer as a PIL image object.
-    image = PIL.Image.open(image_buffer) #, formats=['ps'])
+    image = _pil().Image.open(image_buffer) #, formats=['ps'])
     
     # Return the result.
     return image
-    
+  
 
 # Test whether or not two postscript image data strings produce equivalent 
 # rendered images.
@@ -193,7 +189,10 @@ def equals(ps_a, ps_b):
     
     The postscript image data are converted to rendered images. The postscript 
     strings are not compared directly, because non-visual information -- such 
-    as metadata or comments -- might differ.
+    as metadata or comments -- might differ. Instead, digests of the rendered 
+    images are compared (see `_compare.decode_ps_batch`). The two images are rendered in a 
+    single batch, unless the postscript data are identical apart from 
+    metadata, in which case rendering is skipped.
     
     Arguments
     ---------
@@ -208,15 +207,14 @@ def equals(ps_a, ps_b):
         True if the images described by the two postscript strings are 
         visually-equivalent.
     """
-    
-    # Render image A from postscript data.
-    image_a = convert_to_image(ps_a)
-    
-    # Render image B from postscript data.
-    image_b = convert_to_image(ps_b)
-    
-    # Return the result.
-    return (image_a.tobytes() == image_b.tobytes())
+    # Skip rendering if the data match apart from metadata (see 
+    # `_compare._is_same_ps`).
+    if _is_same_ps(ps_a, ps_b): return True
+    
+    # Otherwise, render the images -- in a single batch -- and compare 
+    # digests of the pixel data.
+    (digest_a, digest_b) = decode_ps_batch([ps_a, ps_b])
+    return (digest_a == digest_b)
     
   
 
@@ -72,6 +72,9 @@ Cleanup by destroying the environment.
 # Contact: a.whit (nml@whit.contact)
 
 
+# Import tkinter.
+import tkinter
+
 # Spheres environment imports.
 import spheres_environment
 
@@ -109,6 +112,23 @@ class Environment(spheres_environment.Environment):
         # Return the result.
         return obj
         
+    def resize_canvas(self, dimensions):
+        """ Re-size the GUI canvas, and re-apply the position and radius of 
+            every object to match the new size.
+        
+        Arguments
+        ---------
+        dimensions : tuple of ints
+            The new width and height of the canvas, in pixels.
+        """
+        
+        # Re-size the canvas.
+        self.gui.canvas.dimensions = dimensions
+        self.gui.canvas.update()
+        
+        # Re-compute the pixel coordinates of every object.
+        for key in self: self[key].invalidate_span()
+        
     def update(self):
         """ Update the GUI canvas. """
         
@@ -118,11 +138,24 @@ class Environment(spheres_environment.Environment):
     def __del__(self):
         """ Cleanup by destroying canvas objects and the GUI. """
         
-        # Destroy canvas items.
-        for obj in self: del obj
+        # The GUI might already have been destroyed explicitly, in which case 
+        # Tk commands can no longer be issued.
+        try:
+            gui_exists = bool(self.gui.winfo_exists())
+        except tkinter.TclError:
+            gui_exists = False
+        
+        # Destroy the canvas items of all objects, with a single canvas 
+        # command.
+        item_ids = [self[key]._circle.id for key in self]
+        if gui_exists and item_ids: self.gui.canvas.delete(*item_ids)
+        
+        # Release the objects while the canvas still exists, so that they are 
+        # not finalized after the GUI has been destroyed.
+        for key in list(self): self.destroy_object(key)
         
-        # Destroy the canvas.
-        self.gui.destroy()
+        # Destroy the GUI.
+        if gui_exists: self.gui.destroy()
     
   
 
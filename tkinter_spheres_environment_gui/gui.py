@@ -134,14 +134,11 @@ class GUI(tkinter_shapes.GUI):
         # It is assumed that the canvas is the only widget in the toplevel.
         self.canvas.pack()
         
-        # Update the GUI to show the canvas.
-        self.update()
-        
-        # Set the default background color.
-        self.canvas.background_color = 'black'
-        
-        # Size the canvas to match the toplevel GUI window.
-        self.canvas.dimensions = self.dimensions
+        # Set the default background color, and size the canvas to match the 
+        # toplevel GUI window. Both are applied with a single configure 
+        # command, before the canvas is first shown.
+        (width, height) = self.dimensions
+        self.canvas.configure(background='black', width=width, height=height)
         
         ## Initialize a rectangular, black polygon, with the same size as the 
         ## canvas. This can be necessary to capture the black background.
@@ -56,6 +56,15 @@ Verify the position change.
 >>> sphere.position
 {'x': 0.5, 'y': 0.5, 'z': 0.5}
 
+Update several properties at once. The circle is re-drawn with a single set 
+of canvas commands.
+
+>>> sphere.update_state(position=(-0.5, 0.0, 0.0), radius=0.1, 
+...                     color=(0, 1, 0, 1))
+>>> canvas.update()
+>>> sphere
+{'position': {'x': -0.5, 'y': 0.0, 'z': 0.0}, 'radius': 0.1}
+
 Clean up by destroying the shapes and the GUI.
 
 >>> del sphere
@@ -79,6 +88,12 @@ import spheres_environment
 import tkinter_shapes
 
 
+# Upper-case, two-digit hexadecimal representations of 8-bit color values.
+_HEX256 = [f'{i:02X}' for i in range(256)]
+
+# Names of the color components, in order.
+_COLOR_KEYS = ('r', 'g', 'b', 'a')
+
 
 # Sphere class.
 class Sphere(spheres_environment.Sphere):
@@ -89,6 +104,16 @@ class Sphere(spheres_environment.Sphere):
         # Initialize a circular canvas item with default attributes.
         self._circle = tkinter_shapes.Circle(canvas=canvas)
         
+        # Initialize the cached color of the circle, as a tuple of normalized 
+        # RGBA values. This is kept in sync by the color setter, so that the 
+        # color getter does not need to query Tk.
+        self._rgba = (0.0, 0.0, 0.0, 0.0)
+        
+        # Cache the span of the canvas, in pixels, for use in coordinate 
+        # transforms. See `invalidate_span`.
+        self._span = min(canvas.dimensions)
+        self._half_span = self._span * 0.5
+        
         # Invoke the superclass constructor.
         super().__init__(*args, **kwargs)
         
@@ -141,12 +166,14 @@ class Sphere(spheres_environment.Sphere):
         spheres_environment.Sphere.position.fset(self, value)
         
         # Broadcast individual coordinate dimensions.
-        (x, y, z) = (self['position'][k] for k in ['x', 'y', 'z'])
+        # The z dimension is not represented on the canvas.
+        position = self['position']
+        (x, y) = (position['x'], position['y'])
         
         # Convert normalized coordinates to pixel coordinates.
-        span = min(self._circle.canvas.dimensions)
-        (x, y) = ((+x+1)/2*span,
-                  (-y+1)/2*span)
+        half_span = self._half_span
+        (x, y) = ((x + 1.0) * half_span,
+                  (1.0 - y) * half_span)
         
         # Set the pixel coordinates of the circle center of mass.
         self._circle.position = (x, y)
@@ -189,8 +216,7 @@ class Sphere(spheres_environment.Sphere):
         spheres_environment.Sphere.radius.fset(self, value)
         
         # Convert from normalized coordinates to pixel coordinates.
-        span = min(self._circle.canvas.dimensions)
-        r = self['radius'] * span / 2
+        r = self['radius'] * self._half_span
         
         # Set the radius of the circle, in pixel coordinates.
         self._circle.radius = r
@@ -204,14 +230,12 @@ class Sphere(spheres_environment.Sphere):
         ## Invoke the superclass property accessor.
         #color = spheres_environment.Sphere.color.fget(self)
         
+        # The color is cached by the setter, rather than queried from the 
+        # canvas item. The cached values are identical to those that would be 
+        # computed via `winfo_rgb`, since Tk scales each 8-bit color component 
+        # by 257 (i.e., 65535 / 255).
         assert self._circle['fill'] == self._circle['outline']
-        alpha = 1.0 if self._circle['fill'] else 0.0
-        to_rgb = self._circle.canvas.winfo_rgb
-        color = to_rgb(self._circle['fill']) if alpha else (0, 0, 0)
-        white = to_rgb('white')
-        rgb = (c/w for (c, w) in zip(color, white)) 
-        keys = ['r', 'g', 'b', 'a']
-        return dict(zip(keys, (*rgb, alpha)))
+        return dict(zip(_COLOR_KEYS, self._rgba))
     
     @color.setter
     def color(self, value):
@@ -221,17 +245,79 @@ class Sphere(spheres_environment.Sphere):
         # This is useful for applying any superclass transforms.
         spheres_environment.Sphere.color.fset(self, value)
         
-        #assert isinstance(value, tuple) and (len(value) == 4)
-        keys = ['r', 'g', 'b', 'a']
-        value = dict(zip(keys, value)) if isinstance(value, tuple) else value
-        assert isinstance(value, dict)
-        assert (list(value) == keys)
-        value = tuple(value[k] for k in keys)
-        (r, g, b) = (round(255*min(max(c, 0), 1)) for c in value[:-1])
-        #a = bool(value[-1])
-        a = float(value[-1] > 0)
-        color_string = f'#{r:02x}{g:02x}{b:02x}'.upper() if a else ''
-        self._circle['fill'] = self._circle['outline'] = color_string
+        # Unpack the color components. Tuples are used as-is, rather than 
+        # converted to a dict.
+        if isinstance(value, tuple):
+            assert (len(value) == len(_COLOR_KEYS))
+            (r, g, b, a) = value
+        else:
+            assert isinstance(value, dict)
+            assert (tuple(value) == _COLOR_KEYS)
+            (r, g, b, a) = (value['r'], value['g'], value['b'], value['a'])
+        (r, g, b) = (round(255*min(max(c, 0), 1)) for c in (r, g, b))
+        #a = bool(a)
+        a = float(a > 0)
+        color_string = f'#{_HEX256[r]}{_HEX256[g]}{_HEX256[b]}' if a else ''
+        
+        # Set the fill and outline colors of the circle with a single 
+        # canvas command.
+        canvas = self._circle.canvas
+        canvas.itemconfigure(self._circle.id, 
+                             fill=color_string, outline=color_string)
+        self._rgba = (r/255, g/255, b/255, a) if a else (0.0, 0.0, 0.0, 0.0)
+    
+    def update_state(self, *, position=None, radius=None, color=None):
+        """ Set any of the position, radius, and color of the sphere at once.
+        
+        Setting the position and radius individually moves and re-sizes the 
+        circle with separate canvas commands. Instead, the bounding box of the 
+        circle is computed once and applied with a single `coords` command, 
+        and the color is applied with a single `itemconfigure` command.
+        
+        Arguments
+        ---------
+        position : tuple
+            Position of the sphere, in normalized coordinates.
+        radius : float
+            Radius of the sphere, in normalized coordinates.
+        color : tuple or dict
+            Fill and outline color of the circle (see `color`).
+        """
+        
+        # Invoke the superclass property accessors, to record the values set.
+        if position is not None:
+            spheres_environment.Sphere.position.fset(self, position)
+        if radius is not None:
+            spheres_environment.Sphere.radius.fset(self, radius)
+        
+        # Convert to pixel coordinates and set the bounding box of the circle.
+        if (position is not None) or (radius is not None):
+            half_span = self._half_span
+            position = self['position']
+            (x, y) = ((position['x'] + 1.0) * half_span,
+                      (1.0 - position['y']) * half_span)
+            r = self['radius'] * half_span
+            canvas = self._circle.canvas
+            canvas.coords(self._circle.id, x - r, y - r, x + r, y + r)
+        
+        # Set the color.
+        if color is not None: self.color = color
+    
+    def invalidate_span(self):
+        """ Re-compute the cached span of the canvas, and re-apply the 
+            position and radius of the sphere.
+        
+        The span -- the smaller of the canvas width and height, in pixels -- 
+        is cached when the sphere is initialized, since it is required for 
+        every coordinate transform. This method must be invoked if the canvas 
+        is re-sized after the sphere is initialized (see 
+        `Environment.resize_canvas`).
+        """
+        self._span = min(self._circle.canvas.dimensions)
+        self._half_span = self._span * 0.5
+        position = self['position']
+        self.position = (position['x'], position['y'], position['z'])
+        self.radius = self['radius']
     
     def __del__(self):
         """ Sphere destructor cleans up and removes the circle from the 